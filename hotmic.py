@@ -1,23 +1,50 @@
 #!/usr/bin/env python3
+import array
 import asyncio
 import contextlib
 import json
+import math
 import os
-import queue
+import shutil
 import signal
-import sys
-import threading
+import struct
 import time
 from dataclasses import dataclass
 from typing import Optional
 
 # Runtime deps (install via requirements.txt):
-#   websockets, sounddevice, pynput
+#   websockets, sounddevice, pynput, orjson (uvloop optional)
 
+import orjson
 import websockets
 import sounddevice as sd
+from websockets.protocol import State
+
+try:
+    from websockets.speedups import apply_mask
+except ImportError:  # C extension not built; pure-Python fallback
+    from websockets.utils import apply_mask
 from pynput import keyboard
 
+try:
+    import uvloop
+except ImportError:  # not available on every platform; fall back to stock asyncio
+    uvloop = None
+
+# Target payload of a single coalesced audio frame (raised to fit at least two blocks)
+MAX_BATCH_BYTES = 16 * 1024
+# Seconds of audio the capture ring can hold before new blocks are dropped
+RING_SECONDS = 10.0
+# Audio frames that may wait for the socket before send_audio applies backpressure
+SEND_QUEUE_DEPTH = 32
+# Transport buffer size above which audio goes through ws.send (and its drain) again
+WS_WRITE_LIMIT = 2**20
+# Seconds to wait before reconnecting after a failed connect or a server-side close
+RECONNECT_INTERVAL = 25.0
+# Static control frames; kept as str so they go out as text frames, which the server expects
+_START_FRAME = json.dumps({"type": "start_recording"})
+_STOP_FRAME = json.dumps({"type": "stop_recording"})
+
 
 @dataclass
 class Config:
@@ -26,10 +53,17 @@ class Config:
     autopaste: bool
     samplerate: int
     channels: int
-    block_samples: int  # samples per audio block
+    block_samples: int  # samples per audio block (power of two)
     input_device: Optional[int]
     connect_timeout: float
     stop_flush_wait: float
+    suggested_latency: float  # seconds; passed to PortAudio as the stream latency
+
+
+def _nearest_pow2(n: int) -> int:
+    lo = 1 << (max(n, 1).bit_length() - 1)
+    hi = lo << 1
+    return lo if n - lo <= hi - n else hi
 
 
 def load_config(path: str = "config.json") -> Config:
@@ -53,78 +87,175 @@ def load_config(path: str = "config.json") -> Config:
     if missing:
         raise SystemExit(f"Missing required config keys: {', '.join(missing)}")
 
+    block_samples = int(data["block_samples"])
+    if block_samples & (block_samples - 1) or block_samples <= 0:
+        rounded = _nearest_pow2(block_samples)
+        print(f"[hotmic] block_samples {block_samples} is not a power of two; using {rounded}")
+        block_samples = rounded
+
+    # Optional tuning knob; missing or null means the default
+    suggested_latency = data.get("suggested_latency")
+    if suggested_latency is None:
+        suggested_latency = 0.005
+
     return Config(
         endpoint=data["endpoint"],
         hotkey=data["hotkey"],
         autopaste=bool(data["autopaste"]),
         samplerate=int(data["samplerate"]),
         channels=int(data["channels"]),
-        block_samples=int(data["block_samples"]),
+        block_samples=block_samples,
         input_device=data.get("input_device"),
         connect_timeout=float(data["connect_timeout"]),
         stop_flush_wait=float(data["stop_flush_wait"]),
+        suggested_latency=float(suggested_latency),
     )
 
 
+class SpscRing:
+    """Fixed-capacity single-producer/single-consumer ring of audio blocks.
+
+    Slots are preallocated ``bytearray``s that the producer (PortAudio
+    callback) copies into, so the audio thread never allocates. The producer
+    only writes ``_head`` and the consumer (event loop) only writes ``_tail``,
+    so neither side needs a lock.
+    """
+
+    def __init__(self, capacity: int, slot_bytes: int):
+        capacity = 1 << max(capacity - 1, 1).bit_length()  # round up to a power of two
+        self._buf = [bytearray(slot_bytes) for _ in range(capacity)]
+        self._mask = capacity - 1
+        self._head = 0
+        self._tail = 0
+
+    def __len__(self) -> int:
+        return self._head - self._tail
+
+    def push(self, data) -> bool:
+        head = self._head
+        if head - self._tail > self._mask:
+            return False  # full: drop rather than block the audio thread
+        self._buf[head & self._mask][:] = data
+        self._head = head + 1
+        return True
+
+    def pop_into(self, out: bytearray) -> bool:
+        tail = self._tail
+        if tail == self._head:
+            return False
+        out += self._buf[tail & self._mask]
+        self._tail = tail + 1
+        return True
+
+
 class Recorder:
-    def __init__(self, cfg: Config):
+    def __init__(self, cfg: Config, loop: asyncio.AbstractEventLoop):
         self.cfg = cfg
+        self._loop = loop
         self._stream: Optional[sd.RawInputStream] = None
-        self._q: "queue.Queue[bytes]" = queue.Queue()
-        self._running = threading.Event()
-        self._running.clear()
+        block_bytes = cfg.block_samples * cfg.channels * 2  # int16
+        capacity = max(2, math.ceil(RING_SECONDS * cfg.samplerate / cfg.block_samples))
+        self._ring = SpscRing(capacity, block_bytes)
+        self._batch_bytes = max(MAX_BATCH_BYTES, 2 * block_bytes)
+        # Consumer parks on this; the producer only wakes the loop while it is parked
+        self._ready = asyncio.Event()
+        self._waiting = False
+        # Read by the PortAudio callback without taking a lock (single int load/store)
+        self._run_flag = array.array("i", [0])
+        self._drained = asyncio.Event()  # set once the stream has delivered its last block
         self._last_chunk_time = 0.0
 
     def start(self):
-        if self._running.is_set():
+        if self._run_flag[0]:
             return
-        self._running.set()
+        self._run_flag[0] = 1
+        self._drained.clear()
+
+        run_flag = self._run_flag
 
         def callback(indata, frames, time_info, status):
             if status:
                 # Non-fatal audio status (overflows/underflows)
                 pass
-            if not self._running.is_set():
+            if not run_flag[0]:
                 return
-            # indata is bytes since RawInputStream with dtype=int16
-            self._q.put(bytes(indata))
+            # indata is a raw int16 buffer; copied into a preallocated slot
+            self._ring.push(indata)
+            if self._waiting:
+                self._loop.call_soon_threadsafe(self._ready.set)
             self._last_chunk_time = time.time()
 
-        self._stream = sd.RawInputStream(
-            samplerate=self.cfg.samplerate,
-            channels=self.cfg.channels,
-            dtype="int16",
-            blocksize=self.cfg.block_samples,
-            callback=callback,
-            device=self.cfg.input_device,
-        )
-        self._stream.start()
-
-    def stop(self):
-        self._running.clear()
-        if self._stream is not None:
-            with contextlib.suppress(Exception):
-                self._stream.stop()
-            with contextlib.suppress(Exception):
-                self._stream.close()
+        try:
+            self._stream = sd.RawInputStream(
+                samplerate=self.cfg.samplerate,
+                channels=self.cfg.channels,
+                dtype="int16",
+                blocksize=self.cfg.block_samples,
+                latency=self.cfg.suggested_latency,
+                callback=callback,
+                finished_callback=self._on_stream_finished,
+                device=self.cfg.input_device,
+            )
+            self._stream.start()
+        except Exception:
+            # Leave the recorder restartable if the device could not be opened or started
+            self._run_flag[0] = 0
+            if self._stream is not None:
+                with contextlib.suppress(Exception):
+                    self._stream.close()
             self._stream = None
+            raise
 
-    def get_chunk_nowait(self) -> Optional[bytes]:
-        try:
-            return self._q.get_nowait()
-        except queue.Empty:
-            return None
-
-    def drain_remaining(self, timeout: float = 0.5) -> list[bytes]:
-        # Give a brief moment for final callback(s) to enqueue
-        time.sleep(timeout)
-        chunks: list[bytes] = []
-        while True:
+    def _on_stream_finished(self):
+        # Runs on the PortAudio thread after the final callback has returned
+        self._loop.call_soon_threadsafe(self._drained.set)
+
+    def stop(self):
+        if self._stream is None:
+            self._run_flag[0] = 0
+            self._loop.call_soon_threadsafe(self._drained.set)  # may run off the loop thread
+            return
+        # Stop before clearing the flag so blocks PortAudio still holds reach the ring
+        with contextlib.suppress(Exception):
+            self._stream.stop()
+        self._run_flag[0] = 0
+        with contextlib.suppress(Exception):
+            self._stream.close()
+        self._stream = None
+
+    def _pop_batches(self) -> list[bytearray]:
+        # Coalesce captured blocks into batches of roughly _batch_bytes each
+        batches: list[bytearray] = []
+        batch = bytearray()
+        while self._ring.pop_into(batch):
+            if len(batch) >= self._batch_bytes:
+                batches.append(batch)
+                batch = bytearray()
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def get_batches(self) -> list[bytearray]:
+        # Wait for at least one block (or a wake()), then hand back everything already captured
+        if not len(self._ring):
+            self._ready.clear()
+            self._waiting = True
             try:
-                chunks.append(self._q.get_nowait())
-            except queue.Empty:
-                break
-        return chunks
+                if not len(self._ring):
+                    await self._ready.wait()
+            finally:
+                self._waiting = False
+        return self._pop_batches()
+
+    def wake(self):
+        # Release a consumer parked in get_batches so it can re-check its own exit condition
+        self._ready.set()
+
+    async def drain_remaining(self, timeout: float = 0.5) -> list[bytearray]:
+        # Wait (at most timeout) for the stream to report its tail was delivered
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._drained.wait(), timeout=timeout)
+        return self._pop_batches()
 
 
 class Session:
@@ -133,175 +264,419 @@ class Session:
         self.ws: Optional[websockets.WebSocketClientProtocol] = None
         self._rx_task: Optional[asyncio.Task] = None
         self._rx_stop = asyncio.Event()
-        self.transcript = ""
+        self._tx_task: Optional[asyncio.Task] = None
+        self._pending: Optional["asyncio.Queue[bytearray]"] = None
+        # The list is only ever cleared, never rebound, so its bound append can be cached
+        self._transcript_parts: list[str] = []
+        self._append_part = self._transcript_parts.append
         self._final_event = asyncio.Event()  # set when status: idle after stop
         self._open = False
         self._awaiting_final = False
+        self._closed_locally = False
+        self._connect_lock = asyncio.Lock()  # keeps the warm-up and a hotkey start from racing
+        self._handlers = {
+            "text": self._on_text,
+            "status": self._on_status,
+            "error": self._on_error,
+        }
+
+    @property
+    def transcript(self) -> str:
+        # Fragments are joined on read so appends in the receive loop stay O(1)
+        return "".join(self._transcript_parts)
 
     async def connect(self):
-        self._final_event.clear()
-        self._rx_stop.clear()
-        self.transcript = ""
+        self._closed_locally = False
         self.ws = await asyncio.wait_for(
-            websockets.connect(self.cfg.endpoint), timeout=self.cfg.connect_timeout
+            websockets.connect(
+                self.cfg.endpoint,
+                compression=None,  # PCM frames don't compress; skip per-message deflate
+                max_size=None,
+                write_limit=WS_WRITE_LIMIT,  # absorb bursty flushes without pausing for drain
+                ping_interval=20,
+                ping_timeout=20,
+            ),
+            timeout=self.cfg.connect_timeout,
         )
         self._open = True
-        self._rx_task = asyncio.create_task(self._receiver())
-
-    async def _receiver(self):
+        # Each connection gets its own closed event, so a late finish of an old receiver
+        # cannot signal (or mark closed) the connection that replaced it
+        self._rx_stop = asyncio.Event()
+        self._rx_task = asyncio.create_task(self._receiver(self.ws, self._rx_stop))
+        self._pending = asyncio.Queue(maxsize=SEND_QUEUE_DEPTH)
+        self._tx_task = asyncio.create_task(self._writer(self.ws, self._pending))
+
+    async def _receiver(self, ws, rx_stop: asyncio.Event):
+        # Hoisted out of the per-message path
+        loads = orjson.loads
+        dispatch = self._handlers.get
         try:
-            async for message in self.ws:
+            async for message in ws:
                 # Server uses JSON text frames
                 try:
-                    data = json.loads(message)
+                    data = loads(message)
                 except Exception:
                     continue
-                typ = data.get("type")
-                if typ == "text":
-                    if data.get("isNewResponse"):
-                        self.transcript = data.get("content", "")
-                    else:
-                        self.transcript += data.get("content", "")
-                elif typ == "status":
-                    # After stop_recording flow completes, server sends 'idle'
-                    if data.get("status") == "idle" and self._awaiting_final:
-                        self._final_event.set()
-                elif typ == "error":
-                    # Treat errors as terminal for this utterance
-                    self._final_event.set()
+                handler = dispatch(data.get("type"))
+                if handler is not None:
+                    handler(data)
         except Exception:
             pass
         finally:
-            self._open = False
-            self._rx_stop.set()
+            if self.ws is ws:
+                self._open = False
+            rx_stop.set()
+
+    def _on_text(self, data: dict):
+        get = data.get
+        if get("isNewResponse"):
+            self._transcript_parts.clear()
+        self._append_part(get("content", ""))
+
+    def _on_status(self, data: dict):
+        # After stop_recording flow completes, server sends 'idle'
+        if data.get("status") == "idle" and self._awaiting_final:
+            self._final_event.set()
+
+    def _on_error(self, data: dict):
+        # Treat errors as terminal for this utterance
+        self._final_event.set()
+
+    @property
+    def is_open(self) -> bool:
+        return self.ws is not None and self._open
+
+    async def ensure_connected(self):
+        async with self._connect_lock:
+            if self.is_open:
+                return
+            if self.ws is not None:
+                await self.close()  # drop the dead socket and its tasks before reconnecting
+            await self.connect()
+
+    @property
+    def closed_locally(self) -> bool:
+        # True when the last connection was ended by close() rather than by the server
+        return self._closed_locally
+
+    async def wait_closed(self):
+        # Returns once the current connection's receiver has ended (server close,
+        # keepalive timeout, or close())
+        await self._rx_stop.wait()
 
     async def start_recording(self):
-        # Reconnect if no socket or previously closed
-        if (self.ws is None) or getattr(self.ws, "closed", True) or (not self._open):
-            await self.connect()
-        await self.ws.send(json.dumps({"type": "start_recording"}))
+        # Normally already connected by HotMic's warm-up; reconnect if it dropped
+        await self.ensure_connected()
+        # The warm socket may have seen frames while idle; start each utterance clean
+        self._awaiting_final = False
+        self._final_event.clear()
+        self._transcript_parts.clear()
+        await self.ws.send(_START_FRAME)
+
+    async def _writer(self, ws, pending: "asyncio.Queue[bytearray]"):
+        # Owns all audio writes for one connection so callers only block when the queue is full
+        while True:
+            chunk = await pending.get()
+            try:
+                if self.ws is ws and self._open and not self._send_binary_fast(ws, chunk):
+                    # websockets copies the payload into its own frame, so no bytes() copy is needed
+                    await ws.send(memoryview(chunk))
+            except Exception:
+                pass
+            finally:
+                pending.task_done()
+
+    def _send_binary_fast(self, ws, payload: bytearray) -> bool:
+        """Write one masked binary frame straight to the transport.
+
+        Returns False when the caller should fall back to ``ws.send``: the
+        connection is not open or the transport is backed up, in which case
+        the library's own flow control should apply.
+        """
+        transport = getattr(ws, "transport", None)
+        if (
+            transport is None
+            or ws.state is not State.OPEN
+            or transport.is_closing()
+            or transport.get_write_buffer_size() > WS_WRITE_LIMIT
+        ):
+            return False
+        n = len(payload)
+        # FIN + binary opcode; client frames always set the mask bit
+        if n < 126:
+            header = struct.pack("!BB", 0x82, 0x80 | n)
+        elif n < 65536:
+            header = struct.pack("!BBH", 0x82, 0x80 | 126, n)
+        else:
+            header = struct.pack("!BBQ", 0x82, 0x80 | 127, n)
+        mask = os.urandom(4)
+        transport.write(header + mask + apply_mask(payload, mask))
+        return True
 
-    async def send_audio(self, chunk: bytes):
-        if self.ws and self._open and chunk:
-            await self.ws.send(chunk)
+    async def send_audio(self, chunk: bytearray):
+        if self._pending is not None and self._open and chunk:
+            await self._pending.put(chunk)
+
+    async def flush(self):
+        # Wait until every queued audio frame has been handed to the socket
+        if self._pending is not None:
+            await self._pending.join()
 
     async def stop_recording(self):
         # The server expects any remaining audio first, then a small delay, then stop message.
         self._awaiting_final = True
-        await self.ws.send(json.dumps({"type": "stop_recording"}))
+        await self.ws.send(_STOP_FRAME)
 
     async def wait_final(self, timeout: float = 20.0):
+        # Also return early if the receiver ends: no final status can arrive after that
+        waiters = [
+            asyncio.ensure_future(self._final_event.wait()),
+            asyncio.ensure_future(self._rx_stop.wait()),
+        ]
         try:
-            await asyncio.wait_for(self._final_event.wait(), timeout=timeout)
-        except asyncio.TimeoutError:
-            pass
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
         finally:
+            for w in waiters:
+                w.cancel()
             self._awaiting_final = False
             self._final_event.clear()
 
     async def close(self):
-        if self.ws:
-            with contextlib.suppress(Exception):
-                await self.ws.close()
-        if self._rx_task:
-            self._rx_task.cancel()
-            with contextlib.suppress(Exception):
-                await self._rx_task
+        # Detach before awaiting anything: a concurrent start then sees the session as
+        # closed and reconnects, and this call only tears down the socket it started with.
+        ws, rx_task, tx_task = self.ws, self._rx_task, self._tx_task
+        self._closed_locally = True
         self._open = False
         self.ws = None
         self._rx_task = None
+        self._tx_task = None
+        self._pending = None
         self._awaiting_final = False
+        if ws:
+            with contextlib.suppress(Exception):
+                await ws.close()
+        for task in (tx_task, rx_task):
+            if task:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await task
+
+
+async def _gather_or_cancel(*aws):
+    # TaskGroup-style structured concurrency for Python < 3.11: the first failure cancels the rest
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+def _clipboard_command() -> Optional[list[str]]:
+    # pbcopy on macOS; Wayland/X11 equivalents elsewhere
+    for cmd in (["pbcopy"], ["wl-copy"], ["xclip", "-selection", "clipboard"]):
+        if shutil.which(cmd[0]):
+            return cmd
+    return None
 
 
 class HotMic:
-    def __init__(self, cfg: Config):
+    def __init__(self, cfg: Config, loop: asyncio.AbstractEventLoop):
         self.cfg = cfg
-        self.rec = Recorder(cfg)
-        self.loop = asyncio.new_event_loop()
-        self._loop_thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._loop_thread.start()
-        self._sending_task: Optional[asyncio.Future] = None
+        self.loop = loop
+        self.rec = Recorder(cfg, loop)
+        self._sending_task: Optional[asyncio.Task] = None
+        self._opening: Optional[asyncio.Future] = None  # in-flight Recorder.start
+        self._start_done = asyncio.Event()  # set once start_recording succeeded or failed
+        self._session_started = False
         self._sess: Optional[Session] = None
-        self._active = False
+        # idle -> starting -> recording -> stopping -> idle. "starting" lasts until the
+        # session's start frame is sent (or fails); a stop may cut it short. Only the
+        # loop thread touches it, so each check-and-set below is atomic between awaits.
+        self._state = "idle"
         self._kb_controller = keyboard.Controller()
-
-    def _run_loop(self):
-        asyncio.set_event_loop(self.loop)
-        self.loop.run_forever()
-
-    def _call_soon(self, coro):
-        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+        self._tasks: set[asyncio.Task] = set()
+        # Open the WebSocket ahead of the first hotkey press and reopen it if it drops while idle
+        self._warm_wake = asyncio.Event()
+        self._warm_task = loop.create_task(self._keep_warm())
+
+    async def _keep_warm(self):
+        # Liveness is left to the library keepalive (ping_interval in Session.connect): when it
+        # gives up, the receiver ends, wait_closed returns and the socket is reopened here.
+        sess = self._ensure_session()
+        delay = 0.0
+        while True:
+            if delay:
+                # Back off after a failed connect or a server-side close so a server that keeps
+                # rejecting us isn't hammered; a stop() still wakes us straight away
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._warm_wake.wait(), timeout=delay)
+                delay = 0.0
+            self._warm_wake.clear()
+            if self._state == "idle" and not sess.is_open:
+                try:
+                    # Tears down any dead socket under the session's connect lock
+                    await sess.ensure_connected()
+                except Exception as e:
+                    print(f"[hotmic] warm connection failed: {e}")
+                    delay = RECONNECT_INTERVAL
+                    continue
+            waiters = [asyncio.ensure_future(self._warm_wake.wait())]
+            if sess.is_open:
+                waiters.append(asyncio.ensure_future(sess.wait_closed()))
+            try:
+                await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for w in waiters:
+                    w.cancel()
+            if not self._warm_wake.is_set() and not sess.closed_locally:
+                delay = RECONNECT_INTERVAL
 
     def _ensure_session(self) -> Session:
         if not self._sess:
             self._sess = Session(self.cfg)
         return self._sess
 
-    def start(self):
-        if self._active:
+    async def start(self):
+        if self._state != "idle":
             return
-        self._active = True
+        self._state = "starting"
+        self._start_done.clear()
+        self._session_started = False
         print("[hotmic] start recording …")
-        self.rec.start()
+        # Opening and starting the PortAudio stream blocks; keep it off the loop
+        self._opening = self.loop.run_in_executor(None, self.rec.start)
+        try:
+            await self._opening
+        except Exception:
+            self._start_done.set()
+            if self._state == "starting":
+                self._state = "idle"
+            raise
+        finally:
+            self._opening = None
+        if self._state != "starting":
+            # Stopped while the device was opening; there is no session to start
+            self._start_done.set()
+            return
         sess = self._ensure_session()
-        # Connect and send start
-        self._call_soon(sess.start_recording()).result()
+        # Connect and send start in the background; audio queues in the ring meanwhile
+        self._sending_task = asyncio.create_task(self._start_then_send(sess))
 
-        # Spawn sender
-        self._sending_task = self._call_soon(self._sender_loop())
+    async def _start_then_send(self, sess: Session):
+        try:
+            await sess.start_recording()
+            self._session_started = True
+        except Exception as e:
+            print(f"[hotmic] failed to start session: {e}")
+        finally:
+            self._start_done.set()
+            if self._state == "starting":
+                self._state = "recording"
+        if self._session_started:
+            await self._sender_loop()
 
     async def _sender_loop(self):
         assert self._sess
         try:
-            while self._active:
-                chunk = self.rec.get_chunk_nowait()
-                if chunk is None:
-                    await asyncio.sleep(0.01)
-                    continue
-                await self._sess.send_audio(chunk)
+            while self._state == "recording":
+                await self._send_batches(await self.rec.get_batches())
         except Exception:
             pass
 
-    def stop(self):
-        if not self._active:
+    async def _send_batches(self, batches: list[bytearray]):
+        assert self._sess
+        for batch in batches:
+            await self._sess.send_audio(batch)
+
+    async def stop(self):
+        if self._state not in ("starting", "recording"):
             return
-        print("[hotmic] stop recording …")
-        self._active = False
-        self.rec.stop()
+        self._state = "stopping"
+        try:
+            await self._stop()
+        finally:
+            self._state = "idle"
+            self._warm_wake.set()  # reconnect now rather than at the next retry
 
-        # Flush any remaining chunks
-        remaining = self.rec.drain_remaining(self.cfg.stop_flush_wait)
-
-        async def _finalize():
-            assert self._sess
-            for c in remaining:
-                await self._sess.send_audio(c)
-            # server expects small delay before stop
-            await asyncio.sleep(0.1)
-            await self._sess.stop_recording()
-            await self._sess.wait_final(timeout=30.0)
-            text = self._sess.transcript.strip()
-            # Close session so next start is clean
-            await self._sess.close()
-            return text
+    async def _stop(self):
+        # Stopping the device while a start is still opening it would race that call
+        if self._opening is not None:
+            with contextlib.suppress(Exception):
+                await self._opening
+        print("[hotmic] stop recording …")
+        await self.loop.run_in_executor(None, self.rec.stop)
 
-        fut = self._call_soon(_finalize())
-        text = fut.result()
+        # connect + flush + final transcript wait, plus slack
+        try:
+            text = await asyncio.wait_for(
+                self._finalize(), timeout=self.cfg.connect_timeout + self.cfg.stop_flush_wait + 35.0
+            )
+        except asyncio.TimeoutError:
+            text = ""
+        except Exception as e:
+            print(f"[hotmic] failed to finish session: {e}")
+            text = ""
+        # Close session so next start is clean; the close handshake overlaps the clipboard write
         if text:
-            self._to_clipboard(text)
-            if self.cfg.autopaste:
+            _, copied = await asyncio.gather(self._sess.close(), self._to_clipboard(text))
+            if copied and self.cfg.autopaste:
                 self._paste_keystroke()
         else:
+            await self._sess.close()
             print("[hotmic] (no transcript received)")
 
-    def _to_clipboard(self, text: str):
+    async def _finalize(self) -> str:
+        assert self._sess
+        # A connect may still be in flight; it is bounded by connect_timeout
+        await self._start_done.wait()
+        # The state is no longer "recording", so the sender exits after its current batch.
+        # It is awaited rather than cancelled: batches it already popped from the ring (and
+        # may be blocked on in send_audio's backpressure) must still reach the server.
+        if self._sending_task is not None:
+            self.rec.wake()
+            with contextlib.suppress(Exception):
+                await self._sending_task
+            self._sending_task = None
+        if not (self._session_started and self._sess.is_open):
+            await self.rec.drain_remaining(0)  # discard audio captured for the failed session
+            return ""
+        # The final-transcript wait runs alongside the tail flush; if either fails the other is cancelled
+        await _gather_or_cancel(self._drain_and_stop(), self._sess.wait_final(timeout=30.0))
+        return self._sess.transcript.strip()
+
+    async def _drain_and_stop(self):
+        assert self._sess
+        # Flush any remaining chunks
+        remaining = await self.rec.drain_remaining(self.cfg.stop_flush_wait)
+        await self._send_batches(remaining)
+        await self._sess.flush()
+        # server expects small delay before stop
+        await asyncio.sleep(0.1)
+        await self._sess.stop_recording()
+
+    async def _to_clipboard(self, text: str) -> bool:
         try:
-            p = os.popen("pbcopy", "w")
-            p.write(text)
-            p.close()
+            cmd = _clipboard_command()
+            if cmd is None:
+                raise RuntimeError("no clipboard tool found (pbcopy, wl-copy or xclip)")
+            proc = await asyncio.create_subprocess_exec(*cmd, stdin=asyncio.subprocess.PIPE)
+            try:
+                await asyncio.wait_for(proc.communicate(text.encode("utf-8")), timeout=2)
+            except asyncio.TimeoutError:
+                # Don't leave a hung clipboard tool behind (subprocess.run's timeout killed it too)
+                with contextlib.suppress(ProcessLookupError):
+                    proc.kill()
+                await proc.wait()
+                raise RuntimeError(f"{cmd[0]} timed out")
+            if proc.returncode:
+                raise RuntimeError(f"{cmd[0]} exited with status {proc.returncode}")
             print("[hotmic] copied transcript to clipboard")
+            return True
         except Exception as e:
             print(f"[hotmic] failed to copy to clipboard: {e}")
+            return False
 
     def _paste_keystroke(self):
         try:
@@ -313,54 +688,56 @@ class HotMic:
         except Exception as e:
             print(f"[hotmic] failed to paste: {e}")
 
-    def shutdown(self):
+    async def shutdown(self):
+        self._warm_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._warm_task
         with contextlib.suppress(Exception):
-            self.stop()
+            await self.stop()
         if self._sess:
-            self._call_soon(self._sess.close()).result(timeout=5)
-        with contextlib.suppress(Exception):
-            self.loop.call_soon_threadsafe(self.loop.stop)
-        if self._loop_thread.is_alive():
-            self._loop_thread.join(timeout=1)
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(self._sess.close(), timeout=5)
+        self.loop.stop()
 
     # Single-key toggle support
-    def toggle(self):
-        if self._active:
-            self.stop()
-        else:
-            self.start()
-
-    # Safe wrappers to avoid crashing hotkey listener on exceptions
+    async def toggle(self):
+        # A press while starting stops right away; presses while stopping are dropped
+        if self._state in ("starting", "recording"):
+            await self.stop()
+        elif self._state == "idle":
+            await self.start()
+
+    # Hotkey callbacks run on pynput's listener thread: hand the work to the loop,
+    # and keep exceptions from reaching (and killing) the listener.
     def safe_toggle(self):
-        try:
-            self.toggle()
-        except Exception as e:
-            print(f"[hotmic] toggle error: {e}")
+        self.loop.call_soon_threadsafe(self._spawn, self.toggle, "toggle")
 
     def safe_start(self):
-        try:
-            self.start()
-        except Exception as e:
-            print(f"[hotmic] start error: {e}")
+        self.loop.call_soon_threadsafe(self._spawn, self.start, "start")
 
     def safe_stop(self):
-        try:
-            self.stop()
-        except Exception as e:
-            print(f"[hotmic] stop error: {e}")
+        self.loop.call_soon_threadsafe(self._spawn, self.stop, "stop")
 
+    def _spawn(self, action, name: str):
+        async def _run():
+            try:
+                await action()
+            except Exception as e:
+                print(f"[hotmic] {name} error: {e}")
 
-def parse_hotkey(hotkey: str):
-    # pynput GlobalHotKeys uses strings such as '<cmd>+<alt>+r'
-    return hotkey
+        task = self.loop.create_task(_run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
 
 
 def main():
     cfg = load_config()
-    hotmic = HotMic(cfg)
+    loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    hotmic = HotMic(cfg, loop)
 
-    # Hotkeys
-    bindings = {parse_hotkey(cfg.hotkey): lambda: hotmic.safe_toggle()}
+    # Hotkeys: pynput GlobalHotKeys takes strings such as '<cmd>+<alt>+r' as-is
+    bindings = {cfg.hotkey: hotmic.safe_toggle}
 
     print("Hotkey:")
     print(f"  toggle: {cfg.hotkey}")
@@ -370,19 +747,22 @@ def main():
     listener = keyboard.GlobalHotKeys(bindings)
 
     # Handle Ctrl+C and SIGTERM gracefully
-    def _sig_handler(signum, frame):
+    def _request_exit():
         print("\n[hotmic] exiting…")
         with contextlib.suppress(Exception):
             listener.stop()
-        hotmic.shutdown()
-        sys.exit(0)
+        hotmic._spawn(hotmic.shutdown, "shutdown")
 
     for s in (signal.SIGINT, signal.SIGTERM):
         with contextlib.suppress(Exception):
-            signal.signal(s, _sig_handler)
-
-    with listener:
-        listener.join()
+            loop.add_signal_handler(s, _request_exit)
+
+    # The listener keeps its own thread; asyncio owns the main thread
+    listener.start()
+    try:
+        loop.run_forever()
+    finally:
+        loop.close()
 
 
 if __name__ == "__main__":